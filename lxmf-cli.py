@@ -347,6 +347,16 @@ class LXMFClient:
                 except Exception as e:
                     self._print_warning(f"Failed to load plugin {plugin_name}: {e}")
 
+    def unload_plugins(self):
+        """Let plugins release threads and files, then drop them"""
+        for plugin_name, plugin in self.plugins.items():
+            try:
+                if hasattr(plugin, 'shutdown'):
+                    plugin.shutdown()
+            except Exception as e:
+                self._print_warning(f"Plugin {plugin_name} shutdown error: {e}")
+        self.plugins = {}
+
     def save_plugins_config(self):
         """Save plugin configuration"""
         try:
@@ -2793,6 +2803,9 @@ class LXMFClient:
         print("\nShutting down...")
         self.stop_event.set()
         
+        # Plugins write out pending data while the client is still up
+        self.unload_plugins()
+        
         # Force save any pending cache updates
         try:
             if self.cache_dirty:
@@ -3193,7 +3206,7 @@ class LXMFClient:
                 self._print_success(f"Plugin {plugin_name} disabled")
                 self._print_warning("Use 'plugin reload' to deactivate")
             elif subcmd == 'reload':
-                self.plugins = {}
+                self.unload_plugins()
                 self.load_plugins()
                 self._print_success("Plugins reloaded")
             else:
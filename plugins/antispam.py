@@ -3,6 +3,7 @@ Anti-Spam Plugin for LXMF-CLI
 Block messages containing specific spam words/phrases
 """
 import os
+import re
 import json
 
 class Plugin:
@@ -122,7 +123,6 @@ class Plugin:
                         censored_preview = censored_preview.replace(word, '*' * len(word))
                     else:
                         # Case-insensitive replacement
-                        import re
                         pattern = re.compile(re.escape(word), re.IGNORECASE)
                         censored_preview = pattern.sub('*' * len(word), censored_preview)
                 
@@ -24,6 +24,9 @@ class Plugin:
         self.FIELD_HTML_CONTENT = 10  # HTML content from server
         self.FIELD_HTML_REQUEST = 11  # HTML request to server
         
+        # Path separators -> '_' for page file names (single C-level pass)
+        self.SAFE_NAME_TABLE = str.maketrans({'/': '_', '\\': '_'})
+        
         # Settings
         self.auto_open = True
         self.cache_pages = True
@@ -209,7 +212,7 @@ class Plugin:
         try:
             # Create temporary file
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            safe_name = page_name.replace('/', '_').replace('\\', '_')
+            safe_name = page_name.translate(self.SAFE_NAME_TABLE)
             
             if self.cache_pages:
                 # Save to cache
@@ -253,7 +256,7 @@ Received: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
         """Save received HTML file to downloads"""
         try:
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            safe_name = page_name.replace('/', '_').replace('\\', '_')
+            safe_name = page_name.translate(self.SAFE_NAME_TABLE)
             file_path = os.path.join(self.downloads_path, f"{timestamp}_{safe_name}")
             
             with open(file_path, 'wb') as f:
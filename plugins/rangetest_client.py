@@ -1,99 +1,73 @@
 # rangetest_client.py
+import atexit
+import re
 import time
 import json
 import subprocess
+import queue
+import threading
+import concurrent.futures
 import os
+import signal
 import shutil
+import traceback
 from datetime import datetime
 
-class Plugin:
-    def __init__(self, client):
-        self.client = client
-        self.commands = ['rangelogs', 'rl', 'rangeexport', 'rex', 'rangestatus', 'rangeclear']
-        self.description = "Range Test Client - Log GPS positions from range test pings"
-        
-        # File paths in Termux storage (persistent, incremental)
-        self.storage_dir = self.client.storage_path
-        self.json_file = os.path.join(self.storage_dir, "rangetest.json")
-        self.kml_file = os.path.join(self.storage_dir, "rangetest.kml")
-        self.csv_file = os.path.join(self.storage_dir, "rangetest.csv")
-        self.geojson_file = os.path.join(self.storage_dir, "rangetest.geojson")
-        self.html_file = os.path.join(self.storage_dir, "rangetest.html")
-        
-        # Initialize files if they don't exist
-        self.init_files()
+# Optional orjson for the JSONL point log - json module fallback
+try:
+    import orjson
     
-    def init_files(self):
-        """Initialize all data files if they don't exist"""
-        try:
-            # JSON
-            if not os.path.exists(self.json_file):
-                with open(self.json_file, 'w') as f:
-                    json.dump({'points': []}, f, indent=2)
-            
-            # CSV
-            if not os.path.exists(self.csv_file):
-                with open(self.csv_file, 'w') as f:
-                    f.write("timestamp,date,time,latitude,longitude,accuracy,speed,altitude,provider,rssi,snr,q\n")
-            
-            # KML
-            if not os.path.exists(self.kml_file):
-                self.init_kml()
-            
-            # GeoJSON
-            if not os.path.exists(self.geojson_file):
-                with open(self.geojson_file, 'w') as f:
-                    json.dump({
-                        "type": "FeatureCollection",
-                        "features": []
-                    }, f, indent=2)
-            
-            # HTML
-            if not os.path.exists(self.html_file):
-                self.init_html()
-        
-        except Exception as e:
-            print(f"[Range Client] ⚠️ Init error: {e}")
+    def dumps_compact(obj):
+        return orjson.dumps(obj).decode('utf-8')
     
-    def init_kml(self):
-        """Initialize KML file with header"""
-        kml_header = '''<?xml version="1.0" encoding="UTF-8"?>
-<kml xmlns="http://www.opengis.net/kml/2.2">
-  <Document>
-    <name>Range Test Coverage</name>
-    <description>LXMF Range Test - All Coverage Points</description>
-    
-    <Style id="rangePoint">
-      <IconStyle>
-        <color>ff0078d4</color>
-        <scale>0.8</scale>
-        <Icon>
-          <href>http://maps.google.com/mapfiles/kml/paddle/blu-circle.png</href>
-        </Icon>
-      </IconStyle>
-    </Style>
+    loads_json = orjson.loads
+except ImportError:
+    def dumps_compact(obj):
+        return json.dumps(obj, separators=(',', ':'))
     
-    <Style id="pathStyle">
-      <LineStyle>
-        <color>ffff0000</color>
-        <width>3</width>
-      </LineStyle>
-    </Style>
-    
-    <Folder>
-      <name>Coverage Points</name>
-'''
-        
-        kml_footer = '''    </Folder>
+    loads_json = json.loads
+
+# Console separators, built once instead of per ping
+SEPARATOR = '=' * 60
+DIVIDER = '─' * 60
+
+# Closing tags that always end rangetest.kml
+KML_FOOTER = '''    </Folder>
   </Document>
 </kml>'''
-        
-        with open(self.kml_file, 'w') as f:
-            f.write(kml_header + kml_footer)
-    
-    def init_html(self):
-        """Initialize HTML map file with path and signal-based coloring"""
-        html = '''<!DOCTYPE html>
+
+# Closing of rangetest.geojson once it holds features (json.dump indent=2 layout)
+GEOJSON_FOOTER = '\n  ]\n}'
+
+# One appended map point (bytes, filled with %-formatting)
+HTML_POINT = b"    <script>addPoint(%.6f, %.6f, %d, '%s', %.1f, %.0f, %.1f, '%s', %s, %s, %s);</script>\n"
+
+def write_at(fp, data, offset):
+    """Write all of data at a byte offset of an unbuffered file"""
+    view = memoryview(data)
+    while view:
+        # Positioned write in one syscall where available (not on Windows)
+        if hasattr(os, 'pwrite'):
+            written = os.pwrite(fp.fileno(), view, offset)
+        else:
+            fp.seek(offset)
+            written = fp.write(view)
+        view = view[written:]
+        offset += written
+
+# One KML placemark (bytes, filled with %-formatting)
+KML_PLACEMARK = b'''      <Placemark>
+        <name>%s %s</name>
+        <description>%s</description>
+        <styleUrl>#rangePoint</styleUrl>
+        <Point>
+          <coordinates>%.6f,%.6f,%.1f</coordinates>
+        </Point>
+      </Placemark>
+'''
+
+# Map page up to the appended points, encoded once at import
+HTML_TEMPLATE = '''<!DOCTYPE html>
 <html>
 <head>
     <meta charset="utf-8">
@@ -148,28 +122,48 @@ class Plugin:
         }).addTo(map);
         
         var markers = [];
+        // [lat, lon] per point - the only copy kept besides Leaflet's own
         var gpsPoints = [];
-        var polyline = null;
-        var rssiValues = [];
-        var snrValues = [];
+        // One path layer, updated in place; redraws are coalesced so a
+        // burst of points (e.g. the whole log on page load) draws once
+        var polyline = L.polyline([], {
+            color: 'red',
+            weight: 4,
+            opacity: 0.7
+        }).addTo(map);
+        var redrawPending = false;
+        // Bounds the view was last fitted to - refit only when a point
+        // lands outside them
+        var fittedBounds = null;
+        var needsFit = false;
+        var rssiSum = 0, rssiCount = 0;
+        var snrSum = 0, snrCount = 0;
         var maxSpeed = 0;
+        var totalDist = 0;
+        
+        // Signal buckets of 10 dBm: <-100, -100, -90, -80, -70, >=-60
+        var COLOR_LUT = [
+            '#ff0000',  // Very Poor (red)
+            '#ff6600',  // Poor (dark orange)
+            '#ffa500',  // Fair (orange)
+            '#ffff00',  // Good (yellow)
+            '#7fff00',  // Very Good (lime)
+            '#00ff00'   // Excellent (green)
+        ];
+        var SIZE_LUT = [8, 8, 8, 10, 12, 14];
+        
+        function signalBucket(rssi) {
+            return Math.min(5, Math.max(0, Math.floor((rssi + 110) / 10)));
+        }
         
         function getSignalColor(rssi) {
             if (rssi === null || rssi === undefined) return '#0078d4';  // Blue if no RSSI
-            if (rssi >= -60) return '#00ff00';  // Excellent (green)
-            if (rssi >= -70) return '#7fff00';  // Very Good (lime)
-            if (rssi >= -80) return '#ffff00';  // Good (yellow)
-            if (rssi >= -90) return '#ffa500';  // Fair (orange)
-            if (rssi >= -100) return '#ff6600'; // Poor (dark orange)
-            return '#ff0000';                    // Very Poor (red)
+            return COLOR_LUT[signalBucket(rssi)];
         }
         
         function getMarkerSize(rssi) {
             if (rssi === null || rssi === undefined) return 10;
-            if (rssi >= -60) return 14;
-            if (rssi >= -70) return 12;
-            if (rssi >= -80) return 10;
-            return 8;
+            return SIZE_LUT[signalBucket(rssi)];
         }
         
         function createSignalIcon(rssi, isStart, isEnd) {
@@ -217,41 +211,55 @@ class Plugin:
         };
         legend.addTo(map);
         
+        // Flat-earth "cheap ruler" scale (km per degree), accurate at
+        // range test distances; the one cos() is redone only after moving
+        // more than 1 degree of latitude
+        var rulerLat = null;
+        var kx = 0;
+        var ky = 110.574;
+        
         function calculateDistance(lat1, lon1, lat2, lon2) {
-            var R = 6371; // Earth radius in km
-            var dLat = (lat2 - lat1) * Math.PI / 180;
-            var dLon = (lon2 - lon1) * Math.PI / 180;
-            var a = Math.sin(dLat/2) * Math.sin(dLat/2) +
-                    Math.cos(lat1 * Math.PI / 180) * Math.cos(lat2 * Math.PI / 180) *
-                    Math.sin(dLon/2) * Math.sin(dLon/2);
-            var c = 2 * Math.atan2(Math.sqrt(a), Math.sqrt(1-a));
-            return R * c;
+            if (rulerLat === null || Math.abs(lat1 - rulerLat) > 1) {
+                rulerLat = lat1;
+                kx = 111.318 * Math.cos(lat1 * Math.PI / 180);
+            }
+            var dx = (lon2 - lon1) * kx;
+            var dy = (lat2 - lat1) * ky;
+            return Math.sqrt(dx * dx + dy * dy);
         }
         
         function getSignalBar(value, min, max, label) {
             if (value === null || value === undefined) return '';
             var percent = Math.max(0, Math.min(100, ((value - min) / (max - min)) * 100));
             var color = getSignalColor(value);
-            return '<div style="margin: 5px 0;">' +
-                   '<span style="font-size: 11px;">' + label + ': ' + value.toFixed(1) + '</span>' +
-                   '<div style="background: #ddd; width: 100px; height: 6px; display: inline-block; margin-left: 5px; border-radius: 3px; vertical-align: middle;">' +
-                   '<div style="background: ' + color + '; width: ' + percent + '%; height: 100%; border-radius: 3px;"></div>' +
-                   '</div></div>';
+            return `<div style="margin: 5px 0;">` +
+                   `<span style="font-size: 11px;">${label}: ${value.toFixed(1)}</span>` +
+                   `<div style="background: #ddd; width: 100px; height: 6px; display: inline-block; margin-left: 5px; border-radius: 3px; vertical-align: middle;">` +
+                   `<div style="background: ${color}; width: ${percent}%; height: 100%; border-radius: 3px;"></div>` +
+                   `</div></div>`;
         }
         
         function addPoint(lat, lon, index, time, speed, accuracy, altitude, provider, rssi, snr, q) {
             var point = [lat, lon];
             gpsPoints.push(point);
             
+            // Accumulate total distance - only the newest segment is new
+            if (gpsPoints.length > 1) {
+                var prev = gpsPoints[gpsPoints.length - 2];
+                totalDist += calculateDistance(prev[0], prev[1], lat, lon);
+            }
+            
             var isStart = (index === 1);
             var isEnd = false; // Will be set later with markEndPoint()
             
-            // Track signal stats
+            // Track signal stats as running sums (constant work per point)
             if (rssi !== null && rssi !== undefined) {
-                rssiValues.push(rssi);
+                rssiSum += rssi;
+                rssiCount++;
             }
             if (snr !== null && snr !== undefined) {
-                snrValues.push(snr);
+                snrSum += snr;
+                snrCount++;
             }
             
             // Track max speed
@@ -259,59 +267,40 @@ class Plugin:
                 maxSpeed = speed;
             }
             
-            // Update or create polyline (path)
-            if (polyline) {
-                map.removeLayer(polyline);
+            // Redraw the path (and refit the view if needed) on the next frame
+            if (fittedBounds === null || !fittedBounds.contains(point)) {
+                needsFit = true;
             }
-            polyline = L.polyline(gpsPoints, {
-                color: 'red',
-                weight: 4,
-                opacity: 0.7
-            }).addTo(map);
+            scheduleRedraw();
             
             // Create marker with signal-based coloring
             var icon = createSignalIcon(rssi, isStart, isEnd);
             var marker = L.marker(point, {icon: icon}).addTo(map);
             
-            // Enhanced popup with ALL GPS and signal data
-            var popupContent = '<div style="min-width: 200px;"><b>Point #' + index + '</b><br>' +
-                'Time: ' + time + '<br>' +
-                'Latitude: ' + lat.toFixed(6) + '<br>' +
-                'Longitude: ' + lon.toFixed(6) + '<br>' +
-                'Altitude: ' + altitude.toFixed(1) + ' m<br>' +
-                'Speed: ' + speed.toFixed(1) + ' km/h<br>' +
-                'Accuracy: ±' + accuracy.toFixed(0) + ' m<br>' +
-                'Provider: ' + provider + '<br>';
-            
-            if (rssi !== null && rssi !== undefined) {
-                popupContent += getSignalBar(rssi, -110, -50, 'RSSI') + '<br>';
-            }
-            if (snr !== null && snr !== undefined) {
-                popupContent += getSignalBar(snr, -10, 20, 'SNR') + '<br>';
-            }
-            if (q !== null && q !== undefined) {
-                popupContent += 'Link Quality: ' + q.toFixed(1) + '%<br>';
-            }
+            // Enhanced popup with ALL GPS and signal data, built in one go
+            var rssiBar = (rssi !== null && rssi !== undefined) ?
+                getSignalBar(rssi, -110, -50, 'RSSI') + '<br>' : '';
+            var snrBar = (snr !== null && snr !== undefined) ?
+                getSignalBar(snr, -10, 20, 'SNR') + '<br>' : '';
+            var quality = (q !== null && q !== undefined) ?
+                `Link Quality: ${q.toFixed(1)}%<br>` : '';
             
-            popupContent += '</div>';
+            var popupContent = `<div style="min-width: 200px;"><b>Point #${index}</b><br>` +
+                `Time: ${time}<br>` +
+                `Latitude: ${lat.toFixed(6)}<br>` +
+                `Longitude: ${lon.toFixed(6)}<br>` +
+                `Altitude: ${altitude.toFixed(1)} m<br>` +
+                `Speed: ${speed.toFixed(1)} km/h<br>` +
+                `Accuracy: ±${accuracy.toFixed(0)} m<br>` +
+                `Provider: ${provider}<br>` +
+                `${rssiBar}${snrBar}${quality}</div>`;
             
             marker.bindPopup(popupContent);
             markers.push(marker);
             
-            // Calculate total distance
-            var totalDist = 0;
-            for (var i = 1; i < gpsPoints.length; i++) {
-                totalDist += calculateDistance(
-                    gpsPoints[i-1][0], gpsPoints[i-1][1],
-                    gpsPoints[i][0], gpsPoints[i][1]
-                );
-            }
-            
             // Calculate average RSSI and SNR
-            var avgRssi = rssiValues.length > 0 ? 
-                rssiValues.reduce((a, b) => a + b, 0) / rssiValues.length : null;
-            var avgSnr = snrValues.length > 0 ? 
-                snrValues.reduce((a, b) => a + b, 0) / snrValues.length : null;
+            var avgRssi = rssiCount > 0 ? rssiSum / rssiCount : null;
+            var avgSnr = snrCount > 0 ? snrSum / snrCount : null;
             
             // Update stats
             document.getElementById('points').textContent = gpsPoints.length;
@@ -320,11 +309,23 @@ class Plugin:
             document.getElementById('avgrssi').textContent = avgRssi !== null ? avgRssi.toFixed(1) + ' dBm' : 'N/A';
             document.getElementById('avgsnr').textContent = avgSnr !== null ? avgSnr.toFixed(1) + ' dB' : 'N/A';
             document.getElementById('lastupdate').textContent = time;
-            
-            // Fit map to show all points with padding
-            if (gpsPoints.length > 0) {
-                map.fitBounds(polyline.getBounds(), {padding: [50, 50]});
+        }
+        
+        function scheduleRedraw() {
+            if (redrawPending) {
+                return;
             }
+            redrawPending = true;
+            requestAnimationFrame(function() {
+                redrawPending = false;
+                polyline.setLatLngs(gpsPoints);
+                if (needsFit) {
+                    // Fit map to show all points with padding
+                    needsFit = false;
+                    fittedBounds = polyline.getBounds();
+                    map.fitBounds(fittedBounds, {padding: [50, 50]});
+                }
+            });
         }
         
         function markEndPoint() {
@@ -338,104 +339,427 @@ class Plugin:
             }
         }
         
-        // POINTS DATA WILL BE INSERTED HERE
-        // POINTS_START
     </script>
-</body>
-</html>'''
+    <!-- Points are appended below, one script tag per logged ping.
+         </body></html> are optional in HTML5 and intentionally omitted. -->
+'''.encode('utf-8')
+
+class Plugin:
+    def __init__(self, client):
+        self.client = client
+        self.commands = ['rangelogs', 'rl', 'rangeexport', 'rex', 'rangestatus', 'rangeclear']
+        self.description = "Range Test Client - Log GPS positions from range test pings"
+        
+        # File paths in Termux storage (persistent, incremental)
+        self.storage_dir = self.client.storage_path
+        self.json_file = os.path.join(self.storage_dir, "rangetest.json")
+        self.jsonl_file = os.path.join(self.storage_dir, "rangetest.jsonl")
+        self.kml_file = os.path.join(self.storage_dir, "rangetest.kml")
+        self.csv_file = os.path.join(self.storage_dir, "rangetest.csv")
+        self.geojson_file = os.path.join(self.storage_dir, "rangetest.geojson")
+        self.html_file = os.path.join(self.storage_dir, "rangetest.html")
+        
+        # Ping tag matcher (anchored) - compiled once, case-insensitive
+        # without lowercasing every incoming message body
+        self.tag_pattern = re.compile(r'\[rangetest\]', re.IGNORECASE)
+        
+        # Platform never changes at runtime - check once, not per ping
+        self.is_termux = os.path.exists('/data/data/com.termux')
+        
+        # Last GPS fix as (monotonic time the probe returned, data) - a ping
+        # looked up within gps_max_age seconds of it reuses a fix that is
+        # accurate enough instead of waking the GPS again. Lookups never
+        # start before their ping arrives, so a reused fix is at most
+        # gps_max_age older than the ping; pings of a test are at least
+        # 5 s apart, so each gets its own position unless it waited
+        # behind a slow probe that finished after it arrived
+        self.gps_cache = None
+        self.gps_max_age = 2
+        self.gps_max_accuracy = 50
+        # A network fix at least this accurate (m) is as good as waiting
+        # out the satellite probe
+        self.gps_good_accuracy = 20
+        
+        # Initialize files if they don't exist
+        self.init_files()
+        
+        # In-memory mirror of the JSON log - avoids re-reading it per ping
+        self.points = self.load_points()
+        # Point count last written to rangetest.json (None = not written yet);
+        # points are only ever appended, so an equal count means up to date
+        self.json_count = None
+        
+        # Points are written by one background thread that owns the log
+        # files: queue items are (generation, map index, point), or None to
+        # request an immediate flush. Batches of POINT_BATCH points, or
+        # whatever arrived within POINT_FLUSH_DELAY seconds
+        self.write_queue = queue.Queue()
+        self.write_lock = threading.Lock()
+        # Bumped by rangeclear so points queued before it are dropped
+        self.generation = 0
+        # Guards points/generation so a point is listed and queued in the
+        # same generation even if rangeclear runs concurrently
+        self.points_lock = threading.Lock()
+        self.POINT_BATCH = 5
+        self.POINT_FLUSH_DELAY = 2
+        # Set by shutdown() - the writer thread exits, nothing more is written
+        self.closed = False
+        self.writer_thread = threading.Thread(target=self.writer_loop, daemon=True)
+        self.writer_thread.start()
+        
+        # GPS lookups for pings run here, off the message handler; one
+        # worker keeps points in arrival order and lets a ping right after
+        # another reuse its cached fix
+        self.gps_pool = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        # Pings submitted but not yet logged (futures drop out when done)
+        self.pending_pings = set()
+        
+        # Append-only logs stay open instead of open/close per ping
+        self.jsonl_fp = None
+        self.csv_fp = None
+        self.html_fp = None
+        self.kml_fp = None
+        self.geojson_fp = None
+        # Byte offset of KML_FOOTER in rangetest.kml (None until verified)
+        self.kml_offset = None
+        # GeoJSON insert point as (byte offset, has_features), None if unknown
+        self.geojson_end = None
+        self.open_logs()
+        
+        # Don't lose a partial batch when the client exits
+        atexit.register(self.shutdown)
+    
+    def init_files(self):
+        """Initialize all data files if they don't exist"""
+        try:
+            # JSON Lines sidecar (one point per line, append-only)
+            if not os.path.exists(self.jsonl_file):
+                self.init_jsonl()
+            
+            # JSON (rebuilt from the sidecar on export/rangelogs)
+            if not os.path.exists(self.json_file):
+                with open(self.json_file, 'w') as f:
+                    json.dump({'points': []}, f, indent=2)
+            
+            # CSV
+            if not os.path.exists(self.csv_file):
+                with open(self.csv_file, 'w') as f:
+                    f.write("timestamp,date,time,latitude,longitude,accuracy,speed,altitude,provider,rssi,snr,q\n")
+            
+            # KML
+            if not os.path.exists(self.kml_file):
+                self.init_kml()
+            
+            # GeoJSON
+            if not os.path.exists(self.geojson_file):
+                with open(self.geojson_file, 'w') as f:
+                    json.dump({
+                        "type": "FeatureCollection",
+                        "features": []
+                    }, f, indent=2)
+            
+            # HTML
+            if not os.path.exists(self.html_file):
+                self.init_html()
+            else:
+                self.migrate_html()
         
-        with open(self.html_file, 'w') as f:
-            f.write(html)
+        except Exception as e:
+            print(f"[Range Client] ⚠️ Init error: {e}")
+    
+    def open_logs(self):
+        """Open log files once (text logs line buffered - flushed per point)"""
+        try:
+            self.jsonl_fp = open(self.jsonl_file, 'a', buffering=1, encoding='utf-8')
+            self.csv_fp = open(self.csv_file, 'a', buffering=1)
+            # Map points are preformatted bytes - one unbuffered append each batch
+            self.html_fp = open(self.html_file, 'ab', buffering=0)
+            # KML is patched in place at its footer, so read/write binary,
+            # unbuffered - positioned writes go straight to the file
+            self.kml_fp = open(self.kml_file, 'r+b', buffering=0)
+            self.kml_offset = self.find_kml_footer()
+            # GeoJSON features are likewise inserted before the closing ]}
+            self.geojson_fp = open(self.geojson_file, 'r+b', buffering=0)
+            self.geojson_end = self.find_geojson_end()
+        except Exception as e:
+            print(f"[Range Client] ⚠️ Could not open log files: {e}")
+    
+    def close_logs(self):
+        """Close the persistent log file handles"""
+        for fp in (self.jsonl_fp, self.csv_fp, self.html_fp, self.kml_fp, self.geojson_fp):
+            if fp is not None:
+                try:
+                    fp.close()
+                except Exception:
+                    pass
+        self.jsonl_fp = None
+        self.csv_fp = None
+        self.html_fp = None
+        self.kml_fp = None
+        self.kml_offset = None
+        self.geojson_fp = None
+        self.geojson_end = None
+    
+    def init_jsonl(self):
+        """Initialize JSONL sidecar, carrying over points from an older JSON log"""
+        points = []
+        if os.path.exists(self.json_file):
+            try:
+                with open(self.json_file, 'r') as f:
+                    points = json.load(f).get('points', [])
+            except Exception as e:
+                print(f"[JSON] ⚠️ Could not migrate {self.json_file}: {e}")
+        
+        with open(self.jsonl_file, 'w', encoding='utf-8') as f:
+            for point in points:
+                f.write(dumps_compact(point) + '\n')
+    
+    def load_points(self):
+        """Read all logged points from the JSONL sidecar"""
+        points = []
+        skipped = 0
+        line = '\n'
+        try:
+            with open(self.jsonl_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    # A line cut short by a crash mid-write is skipped, not
+                    # allowed to stop the plugin from loading
+                    try:
+                        points.append(loads_json(line))
+                    except ValueError:
+                        skipped += 1
+            
+            # Terminate a cut-off last line so the next point appended
+            # starts on a line of its own
+            if not line.endswith('\n'):
+                with open(self.jsonl_file, 'a', encoding='utf-8') as f:
+                    f.write('\n')
+        except FileNotFoundError:
+            pass
+        
+        if skipped:
+            print(f"[JSON] ⚠️ Skipped {skipped} unreadable line(s) in {self.jsonl_file}")
+        return points
+    
+    def write_json(self):
+        """Materialize the composite JSON log from the in-memory points"""
+        # Snapshot, so the count recorded is that of the list written even
+        # if a point is saved meanwhile
+        with self.points_lock:
+            points = list(self.points)
+        data = {'points': points}
+        if self.json_count == len(points) and os.path.exists(self.json_file):
+            return data
+        
+        with open(self.json_file, 'w') as f:
+            json.dump(data, f, indent=2)
+        self.json_count = len(points)
+        return data
+    
+    def init_kml(self):
+        """Initialize KML file with header"""
+        kml_header = '''<?xml version="1.0" encoding="UTF-8"?>
+<kml xmlns="http://www.opengis.net/kml/2.2">
+  <Document>
+    <name>Range Test Coverage</name>
+    <description>LXMF Range Test - All Coverage Points</description>
+    
+    <Style id="rangePoint">
+      <IconStyle>
+        <color>ff0078d4</color>
+        <scale>0.8</scale>
+        <Icon>
+          <href>http://maps.google.com/mapfiles/kml/paddle/blu-circle.png</href>
+        </Icon>
+      </IconStyle>
+    </Style>
+    
+    <Style id="pathStyle">
+      <LineStyle>
+        <color>ffff0000</color>
+        <width>3</width>
+      </LineStyle>
+    </Style>
+    
+    <Folder>
+      <name>Coverage Points</name>
+'''
+        
+        with open(self.kml_file, 'w', encoding='utf-8') as f:
+            f.write(kml_header + KML_FOOTER)
+    
+    def init_html(self):
+        """Initialize HTML map file with path and signal-based coloring"""
+        with open(self.html_file, 'wb') as f:
+            f.write(HTML_TEMPLATE)
+    
+    def migrate_html(self):
+        """Reopen the tail of a map written with the old POINTS_START layout"""
+        marker = b'// POINTS_START'
+        with open(self.html_file, 'r+b') as f:
+            # Only the closing tags need to be inspected, never the points
+            start = max(f.seek(0, os.SEEK_END) - 256, 0)
+            f.seek(start)
+            tail = f.read()
+            pos = tail.rfind(marker)
+            if pos == -1:
+                return
+            
+            # Close the main script where the marker was and drop
+            # </body></html>, so new <script> points append cleanly
+            f.seek(start + pos)
+            f.truncate()
+            f.write(b'\n    </script>\n')
     
     def on_message(self, message, msg_data):
         """Handle incoming RangeTest messages"""
         try:
-            content = msg_data['content'].strip()
-            
-            # Check if it's a RangeTest message
-            if '[RangeTest]' in content or '[rangetest]' in content.lower():
-                # Log GPS position
-                print(f"\n{'='*60}")
-                print(f"📡 Range Test Ping Received!")
-                print(f"{'='*60}")
-                print(f"Message: {content}")
-                
-                # Get GPS location (satellite first, network fallback)
-                gps_data = self.get_gps_location()
-                
-                if gps_data:
-                    # Extract signal data from message
-                    rssi, snr, q = self.extract_link_stats(message)
-                    
-                    # Save to all formats
-                    self.save_point(gps_data, rssi, snr, q)
-                    
-                    print(f"[GPS] ✅ Logged: {gps_data['latitude']:.6f}, {gps_data['longitude']:.6f}")
-                    print(f"      Accuracy: ±{gps_data.get('accuracy', 0):.0f}m")
-                    print(f"      Provider: {gps_data.get('provider', 'unknown')}")
-                    
-                    if rssi is not None:
-                        print(f"[Signal] RSSI: {rssi:.1f} dBm", end="")
-                        if snr is not None:
-                            print(f" | SNR: {snr:.1f} dB", end="")
-                        if q is not None:
-                            print(f" | Q: {q:.1f}%", end="")
-                        print()
-                    
-                    # Notify
-                    self.notify_saved()
-                else:
-                    print(f"[GPS] ❌ GPS unavailable - point NOT logged")
+            raw = msg_data['content']
+            
+            # Server pings always lead with the tag - reject other chat on
+            # its first character before stripping (copying) the message
+            if raw.lstrip()[:1] != '[':
+                return False
+            
+            content = raw.strip()
+            
+            # Check if it's a RangeTest message (anchored tag match)
+            if self.tag_pattern.match(content):
+                # Extract signal data now, while the message is at hand
+                rssi, snr, q = self.extract_link_stats(message)
                 
-                print(f"{'='*60}\n")
+                # The GPS fix can take seconds - get and log it in the
+                # background so message dispatch is never held up
+                future = self.gps_pool.submit(self.log_ping, content, rssi, snr, q)
+                self.pending_pings.add(future)
+                future.add_done_callback(self.pending_pings.discard)
                 
                 return False  # Let message be processed normally
         
         except Exception as e:
             print(f"[Range Client] ⚠️ Message handler error: {e}")
-            import traceback
             traceback.print_exc()
         
         return False
     
-    def get_gps_location(self):
-        """Get GPS location - satellite first (10s), fallback to network (3s)"""
-        is_termux = os.path.exists('/data/data/com.termux')
+    def log_ping(self, content, rssi, snr, q):
+        """Get a GPS fix for a received ping and log it (GPS worker thread)"""
+        try:
+            # Printed here, not in on_message, so each ping's output stays
+            # one block even when pings arrive back to back
+            print(f"\n{SEPARATOR}\n📡 Range Test Ping Received!\n{SEPARATOR}\nMessage: {content}")
+            
+            # Get GPS location (recent fix, else satellite first,
+            # network fallback)
+            gps_data = self.get_gps_cached(self.gps_max_age)
+            
+            if gps_data:
+                # Save to all formats
+                self.save_point(gps_data, rssi, snr, q)
+                
+                lines = [
+                    f"[GPS] ✅ Logged: {gps_data['latitude']:.6f}, {gps_data['longitude']:.6f}",
+                    f"      Accuracy: ±{gps_data.get('accuracy', 0):.0f}m",
+                    f"      Provider: {gps_data.get('provider', 'unknown')}"
+                ]
+                
+                if rssi is not None:
+                    signal = f"[Signal] RSSI: {rssi:.1f} dBm"
+                    if snr is not None:
+                        signal += f" | SNR: {snr:.1f} dB"
+                    if q is not None:
+                        signal += f" | Q: {q:.1f}%"
+                    lines.append(signal)
+                
+                lines.append(f"{SEPARATOR}\n")
+                print("\n".join(lines))
+                
+                # Notify
+                self.notify_saved()
+            else:
+                print(f"[GPS] ❌ GPS unavailable - point NOT logged\n{SEPARATOR}\n")
+            
+        except Exception as e:
+            print(f"[Range Client] ⚠️ GPS logging error: {e}")
+            traceback.print_exc()
+    
+    def get_gps_cached(self, max_age):
+        """Return a recent enough cached fix, else a fresh one"""
+        if self.gps_cache:
+            fetched, data = self.gps_cache
+            age = time.monotonic() - fetched
+            if age < max_age and data.get('accuracy', 999) < self.gps_max_accuracy:
+                return data
         
-        if not is_termux:
+        data = self.get_gps_location()
+        if data:
+            self.gps_cache = (time.monotonic(), data)
+        return data
+    
+    def get_gps_location(self):
+        """Get GPS location - satellite (10s) and network (3s) probed in parallel, satellite preferred"""
+        if not self.is_termux:
             return None
         
-        # Strategy 1: Try GPS (satellite) first with 10 second timeout
-        print("[GPS] Attempt 1: GPS satellite (10s timeout)...")
-        gps = self.try_gps_provider('gps', timeout=10)
-        if gps:
-            return gps
-        
-        # Strategy 2: Fallback to network provider with 3 second timeout
-        print("[GPS] Attempt 2: Network provider (3s timeout)...")
-        gps = self.try_gps_provider('network', timeout=3)
-        if gps:
-            return gps
-        
-        # No GPS available
-        return None
+        # Probe both providers at once so a satellite miss no longer adds
+        # the network timeout on top (worst case 10s instead of 13s)
+        print("[GPS] Probing GPS satellite (10s) and network (3s) in parallel...")
+        pool = concurrent.futures.ThreadPoolExecutor(max_workers=2)
+        procs = []
+        try:
+            gps_future = pool.submit(self.try_gps_provider, 'gps', 10, procs)
+            network_future = pool.submit(self.try_gps_provider, 'network', 3, procs)
+            
+            for future in concurrent.futures.as_completed((gps_future, network_future)):
+                data = future.result()
+                # Strategy 1: GPS (satellite) fix is preferred
+                if future is gps_future:
+                    if data:
+                        return data
+                # Shortcut: a precise network fix ends the wait early
+                elif data and data.get('accuracy', 999) < self.gps_good_accuracy:
+                    return data
+            
+            # Strategy 2: Network provider (both probes have finished)
+            return network_future.result()
+        finally:
+            # Don't block on a probe we no longer need - and don't leave its
+            # termux-location running until timeout either
+            for proc in procs:
+                if proc.poll() is None:
+                    self.kill_probe(proc)
+            pool.shutdown(wait=False)
     
-    def try_gps_provider(self, provider, timeout=5):
-        """Try to get GPS from specific provider"""
+    def try_gps_provider(self, provider, timeout=5, procs=None):
+        """Try to get GPS from specific provider (process added to procs if given)"""
         try:
             cmd = ['termux-location', '-p', provider, '-r', 'once']
             
-            result = subprocess.run(
+            # Own session, so the probe and whatever termux-location starts
+            # under it can be killed together
+            proc = subprocess.Popen(
                 cmd,
-                capture_output=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
                 text=True,
-                timeout=timeout,
-                env=os.environ.copy()
+                start_new_session=True
             )
+            if procs is not None:
+                procs.append(proc)
             
-            if result.returncode == 0 and result.stdout.strip():
+            try:
+                stdout, _ = proc.communicate(timeout=timeout)
+            except subprocess.TimeoutExpired:
+                self.kill_probe(proc)
+                raise
+            
+            # A fix always carries "latitude" - skip parsing empty output
+            # or an empty object
+            if proc.returncode == 0 and '"latitude"' in stdout:
                 try:
-                    data = json.loads(result.stdout.strip())
+                    data = loads_json(stdout)
                     
                     if 'latitude' in data and 'longitude' in data:
                         lat = data.get('latitude')
@@ -461,6 +785,16 @@ class Plugin:
         
         return None
     
+    def kill_probe(self, proc):
+        """Kill a termux-location probe with its whole process group"""
+        # termux-location is a wrapper script - killing only it leaves the
+        # child holding stdout open, so reading the output would block
+        try:
+            os.killpg(proc.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+        proc.wait()
+    
     def extract_link_stats(self, message):
         """Extract RSSI, SNR, and link quality from LXMF message"""
         rssi = None
@@ -468,29 +802,23 @@ class Plugin:
         q = None
         
         try:
-            if hasattr(message, 'packet') and message.packet:
-                packet = message.packet
-                
-                if hasattr(packet, 'rssi'):
-                    rssi = packet.rssi
-                
-                if hasattr(packet, 'snr'):
-                    snr = packet.snr
-                
-                if hasattr(packet, 'q'):
-                    q = packet.q
+            # getattr with a default is one lookup per attribute; a missing
+            # attribute reads as None just like the old hasattr checks
+            packet = getattr(message, 'packet', None)
+            if packet:
+                rssi = getattr(packet, 'rssi', None)
+                snr = getattr(packet, 'snr', None)
+                q = getattr(packet, 'q', None)
             
-            if hasattr(message, 'receipt') and message.receipt:
-                receipt = message.receipt
-                
-                if rssi is None and hasattr(receipt, 'rssi'):
-                    rssi = receipt.rssi
-                
-                if snr is None and hasattr(receipt, 'snr'):
-                    snr = receipt.snr
-                
-                if q is None and hasattr(receipt, 'q'):
-                    q = receipt.q
+            # Receipt only fills in what the packet did not provide
+            receipt = getattr(message, 'receipt', None)
+            if receipt:
+                if rssi is None:
+                    rssi = getattr(receipt, 'rssi', None)
+                if snr is None:
+                    snr = getattr(receipt, 'snr', None)
+                if q is None:
+                    q = getattr(receipt, 'q', None)
         
         except Exception:
             pass
@@ -498,211 +826,347 @@ class Plugin:
         return rssi, snr, q
     
     def save_point(self, gps_data, rssi=None, snr=None, q=None):
-        """Save GPS point to all file formats"""
+        """Save GPS point - queued, then written to all file formats in batches"""
         try:
             timestamp = datetime.now()
-            timestamp_str = timestamp.isoformat()
-            date_str = timestamp.strftime('%Y-%m-%d')
-            time_str = timestamp.strftime('%H:%M:%S')
-            
-            lat = gps_data['latitude']
-            lon = gps_data['longitude']
-            accuracy = gps_data.get('accuracy', 0)
-            speed = gps_data.get('speed', 0)
-            altitude = gps_data.get('altitude', 0)
-            provider = gps_data.get('provider', 'unknown')
-            
-            # Get current point index
-            try:
-                with open(self.json_file, 'r') as f:
-                    data = json.load(f)
-                    point_index = len(data['points']) + 1
-            except:
-                point_index = 1
-            
-            # Save to JSON
-            self.append_to_json(timestamp_str, date_str, time_str, lat, lon, 
-                              accuracy, speed, altitude, provider, rssi, snr, q)
-            
-            # Save to CSV
-            self.append_to_csv(timestamp_str, date_str, time_str, lat, lon, 
-                             accuracy, speed, altitude, provider, rssi, snr, q)
             
-            # Save to KML
-            self.append_to_kml(timestamp_str, date_str, time_str, lat, lon, 
-                             accuracy, speed, altitude, provider, rssi, snr, q)
-            
-            # Save to GeoJSON
-            self.append_to_geojson(timestamp_str, date_str, time_str, lat, lon, 
-                                  accuracy, speed, altitude, provider, rssi, snr, q)
+            point = {
+                'timestamp': timestamp.isoformat(),
+                'date': timestamp.strftime('%Y-%m-%d'),
+                'time': timestamp.strftime('%H:%M:%S'),
+                'latitude': gps_data['latitude'],
+                'longitude': gps_data['longitude'],
+                'accuracy': gps_data.get('accuracy', 0),
+                'speed': gps_data.get('speed', 0),
+                'altitude': gps_data.get('altitude', 0),
+                'provider': gps_data.get('provider', 'unknown'),
+                'rssi': rssi,
+                'snr': snr,
+                'q': q
+            }
             
-            # Save to HTML
-            self.append_to_html(point_index, date_str, time_str, lat, lon, 
-                              accuracy, speed, altitude, provider, rssi, snr, q)
+            # In-memory mirror is current at once; the files are written by
+            # the writer thread, so the message handler never waits on I/O
+            with self.points_lock:
+                self.points.append(point)
+                self.write_queue.put((self.generation, len(self.points), point))
         
         except Exception as e:
             print(f"[Range Client] ⚠️ Save error: {e}")
-            import traceback
             traceback.print_exc()
     
-    def append_to_json(self, timestamp, date, time, lat, lon, accuracy, 
-                       speed, altitude, provider, rssi, snr, q):
-        """Append point to JSON file"""
-        try:
-            with open(self.json_file, 'r') as f:
-                data = json.load(f)
+    def writer_loop(self):
+        """Writer thread - collects queued points into batches and writes them"""
+        while not self.closed:
+            item = self.write_queue.get()
+            items = [item]
+            deadline = time.monotonic() + self.POINT_FLUSH_DELAY
             
-            point = {
-                'timestamp': timestamp,
-                'date': date,
-                'time': time,
-                'latitude': lat,
-                'longitude': lon,
-                'accuracy': accuracy,
-                'speed': speed,
-                'altitude': altitude,
-                'provider': provider,
-                'rssi': rssi,
-                'snr': snr,
-                'q': q
-            }
+            # Gather a batch unless a flush was requested
+            while item is not None and len(items) < self.POINT_BATCH:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = self.write_queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                items.append(item)
+            
+            try:
+                with self.write_lock:
+                    # Points queued before a rangeclear are not written,
+                    # nor any once the plugin is shut down
+                    batch = [x[1:] for x in items
+                             if x is not None and x[0] == self.generation]
+                    if batch and not self.closed:
+                        self.write_batch(batch)
+            except Exception as e:
+                print(f"[Range Client] ⚠️ Write error: {e}")
+            finally:
+                for _ in items:
+                    self.write_queue.task_done()
+    
+    def write_batch(self, batch):
+        """Write points to every log - one write per file per batch"""
+        self.append_to_json(batch)
+        self.append_to_csv(batch)
+        self.append_to_kml(batch)
+        self.append_to_geojson(batch)
+        self.append_to_html(batch)
+    
+    def flush_points(self, ping_wait=0):
+        """Write all queued points now and wait until they are on disk"""
+        # Pings still waiting for a GPS fix are given up to ping_wait
+        # seconds - commands don't wait, they say what is missing
+        pending = list(self.pending_pings)
+        if pending:
+            _, waiting = concurrent.futures.wait(pending, timeout=ping_wait)
+            if waiting:
+                print(f"[Range Client] ⏳ {len(waiting)} ping(s) still waiting for a GPS fix - not written yet")
+        self.write_queue.put(None)
+        self.write_queue.join()
+    
+    def shutdown(self):
+        """Write pending points, then stop the writer and GPS worker and close the logs"""
+        if self.closed:
+            return
+        atexit.unregister(self.shutdown)
+        
+        # Pings still waiting for a fix get one satellite probe's time
+        # (10 s) to finish
+        self.flush_points(12)
+        self.gps_pool.shutdown(wait=False, cancel_futures=True)
+        with self.write_lock:
+            self.closed = True
+            self.close_logs()
+        # Wake the writer so it sees the flag and exits
+        self.write_queue.put(None)
+    
+    def clear_logs(self):
+        """Delete all log files (and unwritten points), then start fresh ones"""
+        with self.write_lock, self.points_lock:
+            # Release open handles before the files are removed
+            self.generation += 1
+            self.close_logs()
             
-            data['points'].append(point)
+            files_to_delete = [
+                self.json_file,
+                self.jsonl_file,
+                self.kml_file,
+                self.csv_file,
+                self.geojson_file,
+                self.html_file
+            ]
             
-            with open(self.json_file, 'w') as f:
-                json.dump(data, f, indent=2)
+            deleted = 0
+            for filepath in files_to_delete:
+                if os.path.exists(filepath):
+                    try:
+                        os.remove(filepath)
+                        deleted += 1
+                    except Exception as e:
+                        print(f"⚠️ Could not delete {os.path.basename(filepath)}: {e}")
+            
+            self.points = []
+            self.json_count = None
+            
+            if deleted > 0:
+                # Re-initialize files
+                self.init_files()
+            
+            self.open_logs()
+            return deleted
+    
+    def append_to_json(self, batch):
+        """Append points to JSON log (JSONL sidecar, one line per point)"""
+        try:
+            self.jsonl_fp.write(''.join(dumps_compact(point) + '\n' for _, point in batch))
         
         except Exception as e:
             print(f"[JSON] ⚠️ Error: {e}")
     
-    def append_to_csv(self, timestamp, date, time, lat, lon, accuracy, 
-                      speed, altitude, provider, rssi, snr, q):
-        """Append point to CSV file"""
+    def append_to_csv(self, batch):
+        """Append points to CSV file"""
         try:
-            with open(self.csv_file, 'a') as f:
-                f.write(f"{timestamp},{date},{time},{lat},{lon},{accuracy},"
-                       f"{speed},{altitude},{provider},{rssi},{snr},{q}\n")
+            self.csv_fp.write(''.join(
+                f"{p['timestamp']},{p['date']},{p['time']},{p['latitude']},{p['longitude']},{p['accuracy']},"
+                f"{p['speed']},{p['altitude']},{p['provider']},{p['rssi']},{p['snr']},{p['q']}\n"
+                for _, p in batch))
         
         except Exception as e:
             print(f"[CSV] ⚠️ Error: {e}")
     
-    def append_to_kml(self, timestamp, date, time, lat, lon, accuracy, 
-                      speed, altitude, provider, rssi, snr, q):
-        """Append point to KML file"""
+    def append_to_kml(self, batch):
+        """Append points to KML file"""
         try:
-            # Read existing file
-            with open(self.kml_file, 'r') as f:
-                content = f.read()
-            
-            # Build description
-            desc = f"{date} {time}\\n"
-            desc += f"Accuracy: ±{accuracy:.0f}m\\n"
-            desc += f"Speed: {speed:.1f} km/h\\n"
-            desc += f"Altitude: {altitude:.1f}m\\n"
-            desc += f"Provider: {provider}"
-            
-            if rssi is not None:
-                desc += f"\\nRSSI: {rssi:.1f} dBm"
-            if snr is not None:
-                desc += f"\\nSNR: {snr:.1f} dB"
-            if q is not None:
-                desc += f"\\nQuality: {q:.1f}%"
-            
-            # Create placemark
-            placemark = f'''      <Placemark>
-        <name>{date} {time}</name>
-        <description>{desc}</description>
-        <styleUrl>#rangePoint</styleUrl>
-        <Point>
-          <coordinates>{lon:.6f},{lat:.6f},{altitude:.1f}</coordinates>
-        </Point>
-      </Placemark>
-'''
+            placemarks = []
+            for _, p in batch:
+                # Build description - one f-string, signal lines only if known
+                desc = [f"{p['date']} {p['time']}\\nAccuracy: ±{p['accuracy']:.0f}m\\n"
+                        f"Speed: {p['speed']:.1f} km/h\\nAltitude: {p['altitude']:.1f}m\\n"
+                        f"Provider: {p['provider']}"]
+                if p['rssi'] is not None:
+                    desc.append(f"RSSI: {p['rssi']:.1f} dBm")
+                if p['snr'] is not None:
+                    desc.append(f"SNR: {p['snr']:.1f} dB")
+                if p['q'] is not None:
+                    desc.append(f"Quality: {p['q']:.1f}%")
+                
+                # Create placemark from the prebuilt template, formatted
+                # straight to bytes (only the text fields are encoded)
+                placemarks.append(KML_PLACEMARK % (
+                    p['date'].encode('utf-8'), p['time'].encode('utf-8'),
+                    '\\n'.join(desc).encode('utf-8'),
+                    p['longitude'], p['latitude'], p['altitude']))
             
-            # Insert before closing Folder tag
-            content = content.replace('    </Folder>', placemark + '    </Folder>')
+            # Overwrite the fixed footer in place with placemarks + footer,
+            # so the file is never re-read and stays valid after each batch;
+            # the footer offset is tracked, so no seek-to-end or check read
+            data = b''.join(placemarks)
+            if self.kml_offset is not None:
+                write_at(self.kml_fp, data + KML_FOOTER.encode('utf-8'), self.kml_offset)
+                self.kml_offset += len(data)
+                return
             
-            with open(self.kml_file, 'w') as f:
-                f.write(content)
+            # Footer not where we expect it (older or hand-edited file):
+            # insert before the closing Folder tag with a full rewrite
+            self.rewrite_kml(data)
         
         except Exception as e:
             print(f"[KML] ⚠️ Error: {e}")
     
-    def append_to_geojson(self, timestamp, date, time, lat, lon, accuracy, 
-                          speed, altitude, provider, rssi, snr, q):
-        """Append point to GeoJSON file"""
+    def rewrite_kml(self, placemark):
+        """Insert placemark bytes before the closing Folder tag by rewriting the KML"""
+        f = self.kml_fp
+        split = self.find_kml_folder_end()
+        if split is None:
+            # No Folder to insert into - appending the footer again would
+            # leave a second closing block, so the file is left as is
+            print("[KML] ⚠️ No </Folder> tag in KML file - points not added")
+            return
+        
+        # The standard footer is restored so the next append can take the
+        # in-place path again
+        f.truncate(split)
+        write_at(f, placemark + KML_FOOTER.encode('utf-8'), split)
+        self.kml_offset = split + len(placemark)
+    
+    def find_kml_footer(self):
+        """Offset of KML_FOOTER if the file ends with it, else None"""
+        footer = KML_FOOTER.encode('utf-8')
+        f = self.kml_fp
+        end = f.seek(0, os.SEEK_END) - len(footer)
+        if end >= 0:
+            f.seek(end)
+            if f.read(len(footer)) == footer:
+                return end
+        return None
+    
+    def find_kml_folder_end(self, block=4096):
+        """Locate the closing Folder tag by reading backwards from the end (None if absent)"""
+        tag = b'    </Folder>'
+        f = self.kml_fp
+        pos = f.seek(0, os.SEEK_END)
+        tail = b''
+        
+        # The closing tags sit at the end, so the placemarks before them
+        # are normally never read
+        while pos > 0:
+            start = max(pos - block, 0)
+            f.seek(start)
+            # Keep a tag-sized overlap so a tag split across blocks is found
+            tail = f.read(pos - start) + tail[:len(tag) - 1]
+            found = tail.rfind(tag)
+            if found != -1:
+                return start + found
+            pos = start
+        
+        return None
+    
+    def append_to_geojson(self, batch):
+        """Append points to GeoJSON file"""
         try:
-            with open(self.geojson_file, 'r') as f:
-                data = json.load(f)
-            
-            feature = {
+            features = [{
                 "type": "Feature",
                 "geometry": {
                     "type": "Point",
-                    "coordinates": [lon, lat, altitude]
+                    "coordinates": [p['longitude'], p['latitude'], p['altitude']]
                 },
                 "properties": {
-                    "timestamp": timestamp,
-                    "date": date,
-                    "time": time,
-                    "accuracy": accuracy,
-                    "speed": speed,
-                    "altitude": altitude,
-                    "provider": provider,
-                    "rssi": rssi,
-                    "snr": snr,
-                    "q": q
+                    "timestamp": p['timestamp'],
+                    "date": p['date'],
+                    "time": p['time'],
+                    "accuracy": p['accuracy'],
+                    "speed": p['speed'],
+                    "altitude": p['altitude'],
+                    "provider": p['provider'],
+                    "rssi": p['rssi'],
+                    "snr": p['snr'],
+                    "q": p['q']
                 }
-            }
+            } for _, p in batch]
             
-            data['features'].append(feature)
+            # Write the features over the closing ]} at the tracked offset,
+            # so the collection is never re-read or re-serialized per point
+            f = self.geojson_fp
+            if self.geojson_end is not None:
+                offset, has_features = self.geojson_end
+                body = ',\n    '.join(dumps_compact(feature) for feature in features)
+                chunk = (b',\n    ' if has_features else b'\n    ') + body.encode('utf-8')
+                write_at(f, chunk + GEOJSON_FOOTER.encode('utf-8'), offset)
+                self.geojson_end = (offset + len(chunk), True)
+                return
             
-            with open(self.geojson_file, 'w') as f:
-                json.dump(data, f, indent=2)
+            # Unexpected layout (older or hand-edited file): full rewrite,
+            # which leaves the standard closing for the next batch
+            f.seek(0)
+            data = json.loads(f.read())
+            data['features'].extend(features)
+            f.truncate(0)
+            write_at(f, json.dumps(data, indent=2).encode('utf-8'), 0)
+            self.geojson_end = self.find_geojson_end()
         
         except Exception as e:
             print(f"[GeoJSON] ⚠️ Error: {e}")
     
-    def append_to_html(self, index, date, time, lat, lon, accuracy, speed, altitude, provider, rssi, snr, q):
-        """Append point to HTML file"""
+    def find_geojson_end(self):
+        """Insert offset and whether features exist, if the file ends as json.dump writes it"""
+        f = self.geojson_fp
+        size = f.seek(0, os.SEEK_END)
+        f.seek(max(size - 16, 0))
+        tail = f.read()
+        
+        footer = GEOJSON_FOOTER.encode('utf-8')
+        if tail.endswith(footer):
+            return size - len(footer), True
+        # Empty collection: insert right after the opening [
+        if tail.endswith(b'[]\n}'):
+            return size - len(b']\n}'), False
+        return None
+    
+    def append_to_html(self, batch):
+        """Append points to HTML file"""
         try:
-            # Format None values as null for JavaScript
-            rssi_str = str(rssi) if rssi is not None else 'null'
-            snr_str = str(snr) if snr is not None else 'null'
-            q_str = str(q) if q is not None else 'null'
-            
-            # Create JavaScript line with ALL parameters
-            js_line = f"        addPoint({lat}, {lon}, {index}, '{time}', {speed:.1f}, {accuracy:.0f}, {altitude:.1f}, '{provider}', {rssi_str}, {snr_str}, {q_str});\n"
-            
-            with open(self.html_file, 'r') as f:
-                content = f.read()
-            
-            # Insert point before POINTS_START marker
-            if '// POINTS_START' in content:
-                content = content.replace('// POINTS_START', js_line + '// POINTS_START')
+            lines = []
+            for index, p in batch:
+                # Format None values as null for JavaScript
+                rssi = b'%r' % p['rssi'] if p['rssi'] is not None else b'null'
+                snr = b'%r' % p['snr'] if p['snr'] is not None else b'null'
+                q = b'%r' % p['q'] if p['q'] is not None else b'null'
+                
+                # Create JavaScript line with ALL parameters, formatted
+                # straight to bytes (no str building + encode per point)
+                lines.append(HTML_POINT % (
+                    p['latitude'], p['longitude'], index, p['time'].encode('utf-8'),
+                    p['speed'], p['accuracy'], p['altitude'],
+                    p['provider'].encode('utf-8'), rssi, snr, q))
             
-            with open(self.html_file, 'w') as f:
-                f.write(content)
+            # Append-only: the page stays open at the end, so a new point
+            # never requires reading or rewriting the existing map
+            self.html_fp.write(b''.join(lines))
         
         except Exception as e:
             print(f"[HTML] ⚠️ Error: {e}")
     
     def notify_saved(self):
         """Notify user that point was saved"""
-        is_termux = os.path.exists('/data/data/com.termux')
-        
         try:
-            if is_termux:
-                os.system('termux-vibrate -d 100 2>/dev/null &')
-                os.system('termux-notification --title "📡 Range Test" --content "GPS point logged!" 2>/dev/null &')
+            if self.is_termux:
+                # Exec directly (no /bin/sh) and don't wait for completion
+                for cmd in (['termux-vibrate', '-d', '100'],
+                            ['termux-notification', '--title', '📡 Range Test',
+                             '--content', 'GPS point logged!']):
+                    subprocess.Popen(cmd,
+                                     stdout=subprocess.DEVNULL,
+                                     stderr=subprocess.DEVNULL,
+                                     start_new_session=True)
         except:
             pass
     
     def export_files(self):
         """Export files to /sdcard/Download with timestamp"""
-        is_termux = os.path.exists('/data/data/com.termux')
-        
-        if not is_termux:
+        if not self.is_termux:
             print("\n❌ Export only works on Termux/Android\n")
             return False
         
@@ -715,6 +1179,10 @@ class Plugin:
         try:
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
             
+            # Bring the composite JSON up to date with the sidecar
+            self.flush_points()
+            self.write_json()
+            
             files_to_export = [
                 (self.json_file, f'rangetest_{timestamp}.json'),
                 (self.kml_file, f'rangetest_{timestamp}.kml'),
@@ -751,7 +1219,14 @@ class Plugin:
             if cmd in ['rangelogs', 'rl']:
                 # Show logged files and stats
                 print(f"\n📁 Range Test Logs")
-                print("─"*60)
+                print(DIVIDER)
+                
+                # Bring the composite JSON up to date with the sidecar
+                try:
+                    self.flush_points()
+                    data = self.write_json()
+                except Exception:
+                    data = {'points': []}
                 
                 files = [
                     (self.json_file, 'JSON'),
@@ -761,29 +1236,34 @@ class Plugin:
                     (self.html_file, 'HTML Map')
                 ]
                 
+                # One directory scan instead of exists() + getsize() per file
+                sizes = {}
+                with os.scandir(self.storage_dir) as entries:
+                    for entry in entries:
+                        if entry.name.startswith('rangetest'):
+                            sizes[entry.path] = entry.stat().st_size
+                
                 for filepath, filetype in files:
-                    if os.path.exists(filepath):
-                        size = os.path.getsize(filepath)
+                    size = sizes.get(filepath)
+                    if size is not None:
                         print(f"  {filetype:10s} {filepath}")
                         print(f"             Size: {size:,} bytes")
                 
                 # Count points
                 try:
-                    with open(self.json_file, 'r') as f:
-                        data = json.load(f)
-                        point_count = len(data.get('points', []))
-                        print(f"\n  Total Points: {point_count}")
-                        
-                        if point_count > 0:
-                            # Show last point info
-                            last_point = data['points'][-1]
-                            print(f"  Last Point: {last_point.get('date')} {last_point.get('time')}")
-                            print(f"              {last_point.get('latitude'):.6f}, {last_point.get('longitude'):.6f}")
-                            print(f"              Provider: {last_point.get('provider')}")
+                    point_count = len(data.get('points', []))
+                    print(f"\n  Total Points: {point_count}")
+                    
+                    if point_count > 0:
+                        # Show last point info
+                        last_point = data['points'][-1]
+                        print(f"  Last Point: {last_point.get('date')} {last_point.get('time')}")
+                        print(f"              {last_point.get('latitude'):.6f}, {last_point.get('longitude'):.6f}")
+                        print(f"              Provider: {last_point.get('provider')}")
                 except:
                     pass
                 
-                print("─"*60)
+                print(DIVIDER)
                 print(f"\n💡 Commands:")
                 print(f"   rangeexport (rex)  - Export to /sdcard/Download/")
                 print(f"   rangestatus        - Check GPS status")
@@ -796,37 +1276,17 @@ class Plugin:
                 # Clear all range test files immediately
                 print(f"\n🗑️ Clearing range test files...")
                 
-                files_to_delete = [
-                    self.json_file,
-                    self.kml_file,
-                    self.csv_file,
-                    self.geojson_file,
-                    self.html_file
-                ]
-                
-                deleted = 0
-                for filepath in files_to_delete:
-                    if os.path.exists(filepath):
-                        try:
-                            os.remove(filepath)
-                            deleted += 1
-                        except Exception as e:
-                            print(f"⚠️ Could not delete {os.path.basename(filepath)}: {e}")
-                
+                deleted = self.clear_logs()
                 if deleted > 0:
-                    # Re-initialize files
-                    self.init_files()
                     print(f"✅ Cleared {deleted} files and reset\n")
                 else:
                     print(f"✅ No files to clear\n")
             
             elif cmd == 'rangestatus':
                 print(f"\n📍 GPS STATUS")
-                print("─"*60)
-                
-                is_termux = os.path.exists('/data/data/com.termux')
+                print(DIVIDER)
                 
-                if not is_termux:
+                if not self.is_termux:
                     print("❌ Not running on Termux")
                     print("   GPS logging only works on Android with Termux\n")
                     return
@@ -883,9 +1343,8 @@ class Plugin:
                 else:
                     print(f"❌ /sdcard/Download/ not found")
                 
-                print("─"*60 + "\n")
+                print(DIVIDER + "\n")
         
         except Exception as e:
             print(f"[Range Client] ⚠️ Command handler error: {e}")
-            import traceback
             traceback.print_exc()
@@ -1,10 +1,19 @@
 # rangetest_server.py
+import re
 import time
+import heapq
+import itertools
 import threading
+import concurrent.futures
+import traceback
 from datetime import datetime
 import RNS
 import LXMF
 
+# Console separators, built once instead of per ping
+SEPARATOR = '=' * 60
+DIVIDER = '─' * 60
+
 class Plugin:
     def __init__(self, client):
         self.client = client
@@ -13,86 +22,67 @@ class Plugin:
         
         # Active tests: {user_hash: test_data}
         self.active_tests = {}
-        self.test_threads = {}
+        
+        # One scheduler thread drives every test: heap of
+        # (due_monotonic, seq, action, user_hash, test)
+        self.schedule = []
+        self.schedule_seq = itertools.count()
+        self.schedule_cond = threading.Condition()
+        self.scheduler_thread = None
+        
+        # Shared pool that runs due actions (pings, start/complete messages)
+        # for all tests; worker threads are created on demand and reused
+        self.workers = concurrent.futures.ThreadPoolExecutor(max_workers=4)
+        
+        # Cached 'HH:MM' for ping messages: (epoch_minute, text)
+        self.clock_cache = (None, '')
         
         # Safety limits
         self.MAX_PINGS = 500
         self.MIN_INTERVAL = 5
         self.MAX_INTERVAL = 300
+        
+        # Incoming message commands: first word -> (handler, takes_args)
+        self.message_handlers = {
+            'rangetest': (self._handle_start_message, True),
+            'rt': (self._handle_start_message, True),
+            'rangestop': (self._handle_stop_message, False),
+            'rs': (self._handle_stop_message, False),
+            'rangestatus': (self._handle_status_message, False)
+        }
+        
+        # Start command arguments: '<keyword> <count> <interval> ...' -
+        # validated and captured in one match, compiled once
+        self.start_pattern = re.compile(r'\S+\s+([+-]?\d+)\s+([+-]?\d+)(?:\s|$)')
     
     def on_message(self, message, msg_data):
         """Handle incoming commands - wrapped in try/except to never crash"""
         try:
-            content = msg_data['content'].strip()
-            source_hash = msg_data['source_hash']
+            raw = msg_data['content']
             
-            # Start test command (rangetest or rt)
-            if content.lower().startswith('rangetest ') or content.lower().startswith('rt '):
-                try:
-                    parts = content.split()
-                    if len(parts) < 3:
-                        self.safe_send(source_hash, 
-                            "❌ Usage: rt <count> <interval>\n"
-                            "Example: rt 50 10")
-                        return True
-                    
-                    count = int(parts[1])
-                    interval = int(parts[2])
-                    
-                    # Validate
-                    if count < 1 or count > self.MAX_PINGS:
-                        self.safe_send(source_hash, 
-                            f"❌ Count must be 1-{self.MAX_PINGS}")
-                        return True
-                    
-                    if interval < self.MIN_INTERVAL or interval > self.MAX_INTERVAL:
-                        self.safe_send(source_hash, 
-                            f"❌ Interval must be {self.MIN_INTERVAL}-{self.MAX_INTERVAL} seconds")
-                        return True
-                    
-                    # Start test
-                    self.start_test(source_hash, count, interval)
-                    return True
-                
-                except ValueError:
-                    self.safe_send(source_hash, 
-                        "❌ Invalid numbers\n"
-                        "Usage: rt <count> <interval>")
-                    return True
-                except Exception as e:
-                    print(f"[Range Test] ⚠️ Error parsing command: {e}")
-                    self.safe_send(source_hash, "❌ Command error")
-                    return True
+            # Every command starts with 'r' - reject other chat on its first
+            # character before stripping (copying) the whole message
+            first = raw.lstrip()[:1]
+            if first != 'r' and first != 'R':
+                return False
             
-            # Stop test command (rangestop or rs)
-            elif content.lower() == 'rangestop' or content.lower() == 'rs':
-                if source_hash in self.active_tests:
-                    self.stop_test(source_hash)
-                    return True
-                else:
-                    self.safe_send(source_hash, "❌ No active test")
-                    return True
+            content = raw.strip()
             
-            # Status command
-            elif content.lower() == 'rangestatus':
-                try:
-                    if source_hash in self.active_tests:
-                        test = self.active_tests[source_hash]
-                        elapsed = int(time.time() - test['start_time'])
-                        remaining = int((test['count'] - test['current']) * test['interval'])
-                        percent = int((test['current'] / test['count']) * 100)
-                        
-                        self.safe_send(source_hash,
-                            f"📡 Range Test Active\n"
-                            f"Progress: {test['current']}/{test['count']} ({percent}%)\n"
-                            f"Elapsed: {elapsed}s\n"
-                            f"Remaining: ~{remaining}s")
-                    else:
-                        self.safe_send(source_hash, "✅ No active test")
-                except Exception as e:
-                    print(f"[Range Test] ⚠️ Status error: {e}")
-                    self.safe_send(source_hash, "❌ Status error")
-                return True
+            # Commands are short - lowercase only the head of the message
+            # (12 chars covers every keyword plus a trailing character)
+            command = content[:12].lower().split(' ', 1)[0]
+            
+            # One dict lookup on the first word instead of a chain of checks
+            entry = self.message_handlers.get(command)
+            if entry is None:
+                return False
+            
+            # Start commands need arguments, the others must stand alone
+            handler, takes_args = entry
+            if takes_args != (len(content) > len(command)):
+                return False
+            
+            return handler(msg_data['source_hash'], content)
         
         except Exception as e:
             print(f"[Range Test] ⚠️ Message handler error: {e}")
@@ -100,187 +90,340 @@ class Plugin:
         
         return False
     
+    def _handle_start_message(self, source_hash, content):
+        """Start test command (rangetest or rt)"""
+        try:
+            match = self.start_pattern.match(content)
+            if match is not None:
+                count = int(match.group(1))
+                interval = int(match.group(2))
+            else:
+                # Anything else takes the split path - bad commands, and
+                # the rarer forms int() accepts ('5_0')
+                parts = content.split()
+                if len(parts) < 3:
+                    self.safe_send(source_hash, 
+                        "❌ Usage: rt <count> <interval>\n"
+                        "Example: rt 50 10")
+                    return True
+                
+                count = int(parts[1])
+                interval = int(parts[2])
+            
+            # Validate
+            if count < 1 or count > self.MAX_PINGS:
+                self.safe_send(source_hash, 
+                    f"❌ Count must be 1-{self.MAX_PINGS}")
+                return True
+            
+            if interval < self.MIN_INTERVAL or interval > self.MAX_INTERVAL:
+                self.safe_send(source_hash, 
+                    f"❌ Interval must be {self.MIN_INTERVAL}-{self.MAX_INTERVAL} seconds")
+                return True
+            
+            # Start test
+            self.start_test(source_hash, count, interval)
+            return True
+        
+        except ValueError:
+            self.safe_send(source_hash, 
+                "❌ Invalid numbers\n"
+                "Usage: rt <count> <interval>")
+            return True
+        except Exception as e:
+            print(f"[Range Test] ⚠️ Error parsing command: {e}")
+            self.safe_send(source_hash, "❌ Command error")
+            return True
+    
+    def _handle_stop_message(self, source_hash, content):
+        """Stop test command (rangestop or rs)"""
+        test = self.active_tests.get(source_hash)
+        if test is not None:
+            self.stop_test(source_hash, test=test)
+        else:
+            self.safe_send(source_hash, "❌ No active test")
+        return True
+    
+    def _handle_status_message(self, source_hash, content):
+        """Status command"""
+        try:
+            test = self.active_tests.get(source_hash)
+            if test is not None:
+                elapsed = int(time.monotonic() - test['start_time'])
+                remaining = int((test['count'] - test['current']) * test['interval'])
+                percent = int((test['current'] / test['count']) * 100)
+                
+                self.safe_send(source_hash,
+                    f"📡 Range Test Active\n"
+                    f"Progress: {test['current']}/{test['count']} ({percent}%)\n"
+                    f"Elapsed: {elapsed}s\n"
+                    f"Remaining: ~{remaining}s")
+            else:
+                self.safe_send(source_hash, "✅ No active test")
+        except Exception as e:
+            print(f"[Range Test] ⚠️ Status error: {e}")
+            self.safe_send(source_hash, "❌ Status error")
+        return True
+    
     def start_test(self, user_hash, count, interval):
         """Start sending pings to user"""
         try:
             # Stop existing test if any
-            if user_hash in self.active_tests:
-                self.stop_test(user_hash, notify=False)
+            existing = self.active_tests.get(user_hash)
+            if existing is not None:
+                self.stop_test(user_hash, notify=False, test=existing)
+            
+            contact = self.client.format_contact_display_short(user_hash)
+            now = time.time()
             
             # Create test record
-            self.active_tests[user_hash] = {
+            test = {
                 'count': count,
                 'interval': interval,
                 'current': 0,
-                'start_time': time.time(),
+                # Monotonic, so elapsed times survive wall-clock changes
+                'start_time': time.monotonic(),
                 'stop_flag': threading.Event(),
-                'failed_sends': 0  # Track failures but don't stop
+                'failed_sends': 0,  # Track failures but don't stop
+                'contact': contact,
+                # Destination hash decoded once for every opportunistic send
+                'dest_bytes': self.hash_to_bytes(user_hash),
+                # RNS destination, built on the first successful send
+                'dest': None,
+                # Ping text with the per-test constants baked in once;
+                # only time, ping number, percent and remaining vary
+                'ping_format': "[RangeTest] [{}] 📡 Ping #{} of " + str(count) + " • {}% • ~{}"
             }
-            
-            contact = self.client.format_contact_display_short(user_hash)
-            start_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            self.active_tests[user_hash] = test
+            start_time = datetime.fromtimestamp(now).strftime('%Y-%m-%d %H:%M:%S')
+            duration = f"~{(count * interval) // 60}m {(count * interval) % 60}s"
             
             # Log locally
-            print(f"\n{'='*60}")
+            print(f"\n{SEPARATOR}")
             print(f"🚀 Range Test Started")
-            print(f"{'='*60}")
+            print(SEPARATOR)
             print(f"Client: {contact}")
             print(f"Pings: {count} @ {interval}s interval")
-            print(f"Duration: ~{(count * interval) // 60}m {(count * interval) % 60}s")
+            print(f"Duration: {duration}")
             print(f"Started: {start_time}")
-            print(f"{'='*60}\n")
+            print(f"{SEPARATOR}\n")
             
             # Send confirmation and start message
             self.safe_send(user_hash,
                 f"✅ Range Test Starting\n"
                 f"Pings: {count} @ {interval}s\n"
-                f"Duration: ~{(count * interval) // 60}m {(count * interval) % 60}s\n\n"
+                f"Duration: {duration}\n\n"
                 f"💡 Quick commands:\n"
                 f"  rs = stop test\n"
                 f"  rangestatus = check progress")
             
-            time.sleep(1)  # Small delay before first ping
-            
-            start_time_short = datetime.now().strftime('%H:%M')
-            self.send_opportunistic(user_hash, 
-                f"[RangeTest] [{start_time_short}] 🚀 Test started")
-            
-            # Start worker thread
-            thread = threading.Thread(
-                target=self._test_worker,
-                args=(user_hash,),
-                daemon=True
-            )
-            self.test_threads[user_hash] = thread
-            thread.start()
+            # Small delay before first ping, waited out on the scheduler
+            # so the message handler returns right away
+            self._schedule(1, self._begin_test, user_hash, test)
         
         except Exception as e:
             print(f"[Range Test] ❌ Start error: {e}")
-            import traceback
             traceback.print_exc()
     
-    def _test_worker(self, user_hash):
-        """Worker thread - sends pings - NEVER STOPS on errors"""
-        test = self.active_tests.get(user_hash)
-        if not test:
+    def clock(self):
+        """Current local time as 'HH:MM', formatted at most once per minute"""
+        now = time.time()
+        minute = int(now // 60)
+        cached_minute, text = self.clock_cache
+        if minute != cached_minute:
+            text = datetime.fromtimestamp(now).strftime('%H:%M')
+            self.clock_cache = (minute, text)
+        return text
+    
+    def _schedule(self, delay, action, user_hash, test):
+        """Queue action(user_hash, test) to run on the worker pool after delay seconds"""
+        with self.schedule_cond:
+            heapq.heappush(self.schedule, (time.monotonic() + delay,
+                                           next(self.schedule_seq),
+                                           action, user_hash, test))
+            self.schedule_cond.notify()
+            
+            if self.scheduler_thread is None:
+                self.scheduler_thread = threading.Thread(
+                    target=self._scheduler_loop,
+                    daemon=True
+                )
+                self.scheduler_thread.start()
+    
+    def _cancel_scheduled(self, test):
+        """Drop every pending action belonging to a test"""
+        with self.schedule_cond:
+            self.schedule = [entry for entry in self.schedule if entry[4] is not test]
+            heapq.heapify(self.schedule)
+    
+    def _scheduler_loop(self):
+        """Scheduler thread - hands due actions for all tests to the worker pool"""
+        while True:
+            with self.schedule_cond:
+                # Sleep until the earliest action is due (or a new one arrives)
+                while True:
+                    if not self.schedule:
+                        self.schedule_cond.wait()
+                        continue
+                    delay = self.schedule[0][0] - time.monotonic()
+                    if delay <= 0:
+                        break
+                    self.schedule_cond.wait(delay)
+                
+                _, _, action, user_hash, test = heapq.heappop(self.schedule)
+            
+            # Run on the shared worker pool so one slow send (path request,
+            # busy interface) never holds up the other tests' pings
+            self.workers.submit(self._run_action, action, user_hash, test)
+    
+    def _run_action(self, action, user_hash, test):
+        """Worker pool task - run one scheduled action - NEVER RAISES"""
+        try:
+            action(user_hash, test)
+        except Exception as e:
+            # LAST RESORT: Log catastrophic error but don't crash
+            print(f"[Range Test] ❌ CRITICAL scheduler error: {e}")
+            traceback.print_exc()
+            self._finish_test(user_hash, test)
+    
+    def _begin_test(self, user_hash, test):
+        """Announce the test start and send the first ping"""
+        if test['stop_flag'].is_set():
+            return
+        
+        start_time_short = self.clock()
+        self.send_opportunistic(test['dest_bytes'], 
+            f"[RangeTest] [{start_time_short}] 🚀 Test started", test)
+        
+        self._send_ping(user_hash, test)
+    
+    def _send_ping(self, user_hash, test):
+        """Send one ping and schedule the next one - NEVER STOPS on send errors"""
+        if test['stop_flag'].is_set():
             return
         
-        contact = self.client.format_contact_display_short(user_hash)
+        contact = test['contact']
+        count = test['count']
+        interval = test['interval']
         
-        # CRITICAL: Wrap entire worker in try/except to prevent thread crash
+        # Increment counter BEFORE sending (so we track attempts, not successes)
+        current_ping = test['current'] + 1
+        test['current'] = current_ping
+        
+        # Calculate progress
+        percent = int((current_ping / count) * 100)
+        remaining_pings = count - current_ping
+        remaining_seconds = remaining_pings * interval
+        
+        # Format remaining time
+        if remaining_seconds >= 60:
+            remaining_str = f"{remaining_seconds // 60}m"
+        else:
+            remaining_str = f"{remaining_seconds}s"
+        
+        # Get current time for ping message
+        ping_time = self.clock()
+        
+        # Build message with % and remaining time
+        msg = test['ping_format'].format(ping_time, current_ping, percent, remaining_str)
+        
+        # Try to send - but NEVER stop on error
         try:
-            while test['current'] < test['count']:
-                # Check stop flag
-                if test['stop_flag'].is_set():
-                    print(f"[Range Test] ⚠️ Test stopped for {contact}")
-                    break
-                
-                # Increment counter BEFORE sending (so we track attempts, not successes)
-                test['current'] += 1
-                current_ping = test['current']
-                
-                # Calculate progress
-                percent = int((current_ping / test['count']) * 100)
-                remaining_pings = test['count'] - current_ping
-                remaining_seconds = remaining_pings * test['interval']
-                
-                # Format remaining time
-                if remaining_seconds >= 60:
-                    remaining_str = f"{remaining_seconds // 60}m"
-                else:
-                    remaining_str = f"{remaining_seconds}s"
-                
-                # Get current time for ping message
-                ping_time = datetime.now().strftime('%H:%M')
-                
-                # Build message with % and remaining time
-                msg = f"[RangeTest] [{ping_time}] 📡 Ping #{current_ping} of {test['count']} • {percent}% • ~{remaining_str}"
-                
-                # Try to send - but NEVER stop on error
-                try:
-                    print(f"[Range Test] Sending ping {current_ping}/{test['count']} ({percent}%, ~{remaining_str}) @ {ping_time} → {contact}")
-                    self.send_opportunistic(user_hash, msg)
-                except Exception as send_error:
-                    # Log but CONTINUE
-                    print(f"[Range Test] ⚠️ Send failed (continuing): {send_error}")
-                    test['failed_sends'] += 1
-                
-                # Wait for next interval (check stop flag every second)
-                # CRITICAL: Even if interval wait fails, we continue
-                try:
-                    for _ in range(test['interval']):
-                        if test['stop_flag'].wait(1):
-                            break
-                except Exception as wait_error:
-                    print(f"[Range Test] ⚠️ Wait error (continuing): {wait_error}")
-                    time.sleep(1)  # Fallback sleep
-            
-            # Test complete (if not stopped)
-            if not test['stop_flag'].is_set():
-                end_time = datetime.now().strftime('%H:%M')
-                elapsed = int(time.time() - test['start_time'])
-                
-                print(f"\n{'='*60}")
-                print(f"✅ Range Test Complete")
-                print(f"{'='*60}")
-                print(f"Client: {contact}")
-                print(f"Sent: {test['current']}/{test['count']} pings")
-                if test['failed_sends'] > 0:
-                    print(f"Failed: {test['failed_sends']} (continued anyway)")
-                print(f"Duration: {elapsed // 60}m {elapsed % 60}s")
-                print(f"Finished: {end_time}")
-                print(f"{'='*60}\n")
-                
-                # Try to send completion message, but don't crash if it fails
-                try:
-                    self.send_opportunistic(user_hash,
-                        f"[RangeTest] [{end_time}] ✅ Test complete! 100%")
-                except Exception as e:
-                    print(f"[Range Test] ⚠️ Could not send completion message: {e}")
+            print(f"[Range Test] Sending ping {current_ping}/{count} ({percent}%, ~{remaining_str}) @ {ping_time} → {contact}")
+            self.send_opportunistic(test['dest_bytes'], msg, test)
+        except Exception as send_error:
+            # Log but CONTINUE
+            print(f"[Range Test] ⚠️ Send failed (continuing): {send_error}")
+            test['failed_sends'] += 1
+        
+        # Next ping, or completion one interval after the last ping
+        if test['stop_flag'].is_set():
+            return
+        if current_ping < count:
+            self._schedule(interval, self._send_ping, user_hash, test)
+        else:
+            self._schedule(interval, self._complete_test, user_hash, test)
+    
+    def _complete_test(self, user_hash, test):
+        """Report a finished test and release it"""
+        if test['stop_flag'].is_set():
+            return
+        
+        contact = test['contact']
+        end_time = self.clock()
+        elapsed = int(time.monotonic() - test['start_time'])
         
+        print(f"\n{SEPARATOR}")
+        print(f"✅ Range Test Complete")
+        print(SEPARATOR)
+        print(f"Client: {contact}")
+        print(f"Sent: {test['current']}/{test['count']} pings")
+        if test['failed_sends'] > 0:
+            print(f"Failed: {test['failed_sends']} (continued anyway)")
+        print(f"Duration: {elapsed // 60}m {elapsed % 60}s")
+        print(f"Finished: {end_time}")
+        print(f"{SEPARATOR}\n")
+        
+        # Try to send completion message, but don't crash if it fails
+        try:
+            self.send_opportunistic(test['dest_bytes'],
+                f"[RangeTest] [{end_time}] ✅ Test complete! 100%", test)
         except Exception as e:
-            # LAST RESORT: Log catastrophic error but don't crash
-            print(f"[Range Test] ❌ CRITICAL worker error: {e}")
-            import traceback
-            traceback.print_exc()
+            print(f"[Range Test] ⚠️ Could not send completion message: {e}")
         
-        finally:
-            # ALWAYS cleanup, even if something goes wrong
-            try:
-                if user_hash in self.active_tests:
-                    del self.active_tests[user_hash]
-                if user_hash in self.test_threads:
-                    del self.test_threads[user_hash]
-            except Exception as cleanup_error:
-                print(f"[Range Test] ⚠️ Cleanup error: {cleanup_error}")
+        self._finish_test(user_hash, test)
+    
+    def _finish_test(self, user_hash, test):
+        """Release a test record - ALWAYS safe to call"""
+        try:
+            # Only drop our own record - a restarted test may own the slot
+            if self.active_tests.get(user_hash) is test:
+                del self.active_tests[user_hash]
+        except Exception as cleanup_error:
+            print(f"[Range Test] ⚠️ Cleanup error: {cleanup_error}")
     
-    def stop_test(self, user_hash, notify=True):
+    def stop_test(self, user_hash, notify=True, test=None):
         """Stop active test"""
         try:
-            if user_hash not in self.active_tests:
-                return
+            if test is None:
+                test = self.active_tests.get(user_hash)
+                if test is None:
+                    return
             
-            test = self.active_tests[user_hash]
             test['stop_flag'].set()
+            self._cancel_scheduled(test)
+            self._finish_test(user_hash, test)
             
-            contact = self.client.format_contact_display_short(user_hash)
+            contact = test['contact']
             percent = int((test['current'] / test['count']) * 100)
             print(f"\n[Range Test] ⚠️ Stopping test for {contact} at {percent}%\n")
             
             if notify:
-                stop_time = datetime.now().strftime('%H:%M')
-                self.send_opportunistic(user_hash,
-                    f"[RangeTest] [{stop_time}] ⚠️ Test stopped at {percent}%")
+                stop_time = self.clock()
+                self.send_opportunistic(test['dest_bytes'],
+                    f"[RangeTest] [{stop_time}] ⚠️ Test stopped at {percent}%", test)
         
         except Exception as e:
             print(f"[Range Test] ⚠️ Stop error: {e}")
     
-    def send_opportunistic(self, dest_hash, content):
+    def hash_to_bytes(self, dest_hash):
+        """Normalize a displayed hash string to destination hash bytes"""
+        dest_hash_str = dest_hash.replace(":", "").replace(" ", "").replace("<", "").replace(">", "")
+        return bytes.fromhex(dest_hash_str)
+    
+    def send_opportunistic(self, dest_hash, content, test=None):
         """Send opportunistic message (fire-and-forget) - wrapped for safety"""
         try:
-            # Normalize hash
-            dest_hash_str = dest_hash.replace(":", "").replace(" ", "").replace("<", "").replace(">", "")
-            dest_hash_bytes = bytes.fromhex(dest_hash_str)
+            # Reuse the destination built for an earlier ping of this test
+            if test is not None and test['dest'] is not None:
+                self.client.router.handle_outbound(self.build_message(test['dest'], content))
+                return
+            
+            # Tests pass pre-decoded bytes; strings are normalized here
+            if isinstance(dest_hash, bytes):
+                dest_hash_bytes = dest_hash
+            else:
+                dest_hash_bytes = self.hash_to_bytes(dest_hash)
             
             # Get identity
             dest_identity = RNS.Identity.recall(dest_hash_bytes)
@@ -303,22 +446,28 @@ class Plugin:
                 "delivery"
             )
             
-            # Create opportunistic message
-            message = LXMF.LXMessage(
-                destination=dest,
-                source=self.client.destination,
-                content=content,
-                title="",
-                desired_method=LXMF.LXMessage.OPPORTUNISTIC
-            )
-            
             # Send without tracking
-            self.client.router.handle_outbound(message)
+            self.client.router.handle_outbound(self.build_message(dest, content))
+            
+            if test is not None:
+                test['dest'] = dest
         
         except Exception as e:
-            # Log but don't crash
+            # Log but don't crash - rebuild the destination next time
+            if test is not None:
+                test['dest'] = None
             print(f"[Range Test] ⚠️ Send error (continuing): {e}")
     
+    def build_message(self, dest, content):
+        """Create an opportunistic LXMF message for a destination"""
+        return LXMF.LXMessage(
+            destination=dest,
+            source=self.client.destination,
+            content=content,
+            title="",
+            desired_method=LXMF.LXMessage.OPPORTUNISTIC
+        )
+    
     def safe_send(self, dest_hash, content):
         """Send message with standard delivery - used for commands/confirmations"""
         try:
@@ -332,10 +481,11 @@ class Plugin:
             if cmd in ['rangetest', 'rt']:
                 if self.active_tests:
                     print("\n📡 Active Range Tests:")
-                    print("─"*60)
+                    print(DIVIDER)
+                    now = time.monotonic()
                     for user_hash, test in self.active_tests.items():
                         contact = self.client.format_contact_display_short(user_hash)
-                        elapsed = int(time.time() - test['start_time'])
+                        elapsed = int(now - test['start_time'])
                         remaining = int((test['count'] - test['current']) * test['interval'])
                         percent = int((test['current'] / test['count']) * 100)
                         print(f"  {contact}:")
@@ -343,7 +493,7 @@ class Plugin:
                         print(f"    Elapsed: {elapsed}s | Remaining: ~{remaining}s")
                         if test['failed_sends'] > 0:
                             print(f"    Failed: {test['failed_sends']} (test continuing)")
-                    print("─"*60 + "\n")
+                    print(DIVIDER + "\n")
                 else:
                     print("\n✅ No active tests\n")
                     print("💡 Quick start: send <contact> rt 50 10")
@@ -21,6 +21,7 @@ class Plugin:
             r'Name:\s*(.+?)\n.*?LXMF Address:\s*\n([a-fA-F0-9]+)',
             re.DOTALL
         )
+        self.display_name_pattern = re.compile(r'Display Name:\s*(.+?)\n')
     
     def on_message(self, message, msg_data):
         """Check if incoming message contains a contact card"""
@@ -42,7 +43,7 @@ class Plugin:
                 
                 # Also try to extract display name
                 display_name = None
-                display_match = re.search(r'Display Name:\s*(.+?)\n', content)
+                display_match = self.display_name_pattern.search(content)
                 if display_match:
                     display_name = display_match.group(1).strip()
                 
@@ -180,7 +181,7 @@ class Plugin:
             
             # Try to extract display name
             display_name = None
-            display_match = re.search(r'Display Name:\s*(.+?)\n', content)
+            display_match = self.display_name_pattern.search(content)
             if display_match:
                 display_name = display_match.group(1).strip()
             